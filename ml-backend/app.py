@@ -6,7 +6,6 @@ import cv2
 import torch
 import numpy as np
 from ultralytics import YOLO
-from tensorflow.keras.models import load_model
 import face_recognition
 import os
 import sys # For error logging
@@ -16,6 +15,7 @@ import torchvision.transforms as transforms # For age estimation transforms
 import torchvision.models as models # For age estimation model definition
 import torch.nn as nn # For age estimation model definition
 import base64 # For encoding image data for depth heatmap
+from emotion_model_torch import EMOTION_TORCH_MODEL_PATH, load_emotion_model # TensorFlow-free emotion model
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -25,6 +25,13 @@ CORS(app) # Enable CORS for all routes, allowing frontend to access it
 AGE_MODEL_PATH = os.path.join(os.path.dirname(__file__), 'age_model_efficientnetb0.pth')
 HAARCASCADE_PATH_AGE = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml' # For age estimation face detection
 
+# --- Configuration for Emotion Detection Model ---
+# 'torch' serves the converted emotion_model.pt (see convert_emotion_model.py) without importing TensorFlow,
+# 'keras' serves the original emotion_model.h5, 'auto' picks 'torch' whenever the converted model exists.
+EMOTION_BACKEND = os.environ.get('EMOTION_BACKEND', 'auto').lower()
+if EMOTION_BACKEND == 'auto':
+    EMOTION_BACKEND = 'torch' if os.path.exists(EMOTION_TORCH_MODEL_PATH) else 'keras'
+
 # --- Define the Age Regression Model (EfficientNetB0) ---
 class AgeRegressionModel(nn.Module):
     def __init__(self, num_classes=1): # num_classes=1 for regression
@@ -81,8 +88,15 @@ try:
     print("MiDaS model loaded successfully.", file=sys.stderr)
 
     # Load Emotion Detection model
-    emotion_model = load_model("emotion_model.h5")
-    print("Emotion detection model loaded successfully.", file=sys.stderr)
+    if EMOTION_BACKEND == 'torch':
+        emotion_model = load_emotion_model(EMOTION_TORCH_MODEL_PATH, device)
+    elif EMOTION_BACKEND == 'keras':
+        # Imported lazily so the 'torch' backend never loads the TensorFlow runtime
+        from tensorflow.keras.models import load_model
+        emotion_model = load_model("emotion_model.h5")
+    else:
+        raise Exception(f"Unknown EMOTION_BACKEND '{EMOTION_BACKEND}'. Use 'torch', 'keras' or 'auto'.")
+    print(f"Emotion detection model loaded successfully ({EMOTION_BACKEND} backend).", file=sys.stderr)
 
     # Load Age Estimation model
     age_model = AgeRegressionModel()
@@ -275,7 +289,12 @@ def predict_emotion():
             roi_normalized = roi_resized / 255.0
             roi_input = roi_normalized.reshape(1, IMG_SIZE, IMG_SIZE, 1)
 
-            predictions = emotion_model.predict(roi_input, verbose=0) # verbose=0 to suppress output
+            if EMOTION_BACKEND == 'torch':
+                with torch.no_grad():
+                    input_tensor = torch.from_numpy(roi_input.astype(np.float32)).to(device)
+                    predictions = emotion_model(input_tensor).cpu().numpy()
+            else:
+                predictions = emotion_model.predict(roi_input, verbose=0) # verbose=0 to suppress output
             pred_index = np.argmax(predictions)
             label = emotion_labels[pred_index]
             confidence = float(predictions[0][pred_index])
@@ -0,0 +1,176 @@
+# ml-backend/convert_emotion_model.py
+#
+# Converts the Keras emotion model (emotion_model.h5) into a PyTorch checkpoint
+# (emotion_model.pt) so app.py can serve /predict_emotion without TensorFlow.
+# TensorFlow is only needed to run this script, not to run the server.
+#
+# Usage:
+#   python convert_emotion_model.py [--input emotion_model.h5] [--output emotion_model.pt]
+
+import argparse
+import sys
+
+import numpy as np
+import torch
+from tensorflow.keras.models import load_model
+
+from emotion_model_torch import EMOTION_TORCH_MODEL_PATH, EmotionModel, load_emotion_model
+
+KERAS_MODEL_PATH = 'emotion_model.h5'
+IMG_SIZE = 48 # Must match the emotion model input used in app.py
+
+
+def _activation_name(config):
+    activation = config.get('activation', 'linear')
+    if activation not in ('linear', 'relu', 'elu', 'selu', 'sigmoid', 'tanh', 'softmax'):
+        raise ValueError(f"Unsupported activation: {activation}")
+    return activation
+
+
+def _pool_spec(kind, config):
+    if config.get('padding', 'valid') != 'valid':
+        raise ValueError(f"Unsupported pooling padding: {config['padding']}")
+    pool_size = list(config['pool_size'])
+    strides = list(config['strides'] or pool_size)
+    return {'type': kind, 'kernel_size': pool_size, 'stride': strides}
+
+
+def convert_keras_model(keras_model):
+    """Translate a Keras Sequential CNN into (layer spec, PyTorch state dict)."""
+    # Track the running NHWC output shape so Conv/Dense/BatchNorm sizes are known
+    shape = list(keras_model.input_shape[1:])
+    spatial = True
+    layers = []
+    weights = []
+
+    for layer in keras_model.layers:
+        kind = layer.__class__.__name__
+        config = layer.get_config()
+        params = layer.get_weights()
+
+        if kind == 'InputLayer':
+            continue
+        elif kind == 'Conv2D':
+            strides = list(config['strides'])
+            if config['padding'] == 'same' and strides != [1, 1]:
+                raise ValueError("Conv2D with padding='same' and stride > 1 is not supported")
+            if list(config.get('dilation_rate', (1, 1))) != [1, 1]:
+                raise ValueError("Dilated Conv2D is not supported")
+            spec = {
+                'type': 'conv2d',
+                'in_channels': shape[-1],
+                'out_channels': config['filters'],
+                'kernel_size': list(config['kernel_size']),
+                'stride': strides,
+                'padding': config['padding'],
+                'use_bias': config['use_bias'],
+                'activation': _activation_name(config),
+            }
+            # Keras kernels are (kh, kw, in, out); PyTorch expects (out, in, kh, kw)
+            tensors = {'weight': params[0].transpose(3, 2, 0, 1)}
+            if config['use_bias']:
+                tensors['bias'] = params[1]
+        elif kind == 'Dense':
+            if spatial:
+                raise ValueError("Dense layer applied before Flatten is not supported")
+            spec = {
+                'type': 'dense',
+                'in_features': shape[-1],
+                'out_features': config['units'],
+                'use_bias': config['use_bias'],
+                'activation': _activation_name(config),
+            }
+            # Keras kernels are (in, out); PyTorch expects (out, in)
+            tensors = {'weight': params[0].T}
+            if config['use_bias']:
+                tensors['bias'] = params[1]
+        elif kind == 'BatchNormalization':
+            scale, center = config.get('scale', True), config.get('center', True)
+            if scale != center:
+                raise ValueError("BatchNormalization with only one of scale/center is not supported")
+            spec = {
+                'type': 'batch_norm',
+                'num_features': shape[-1],
+                'eps': config['epsilon'],
+                'affine': scale,
+                'spatial': spatial,
+            }
+            tensors = {}
+            if scale:
+                tensors['weight'], tensors['bias'] = params[0], params[1]
+            tensors['running_mean'], tensors['running_var'] = params[-2], params[-1]
+        elif kind == 'MaxPooling2D':
+            spec, tensors = _pool_spec('max_pool2d', config), {}
+        elif kind == 'AveragePooling2D':
+            spec, tensors = _pool_spec('avg_pool2d', config), {}
+        elif kind == 'GlobalAveragePooling2D':
+            spec, tensors = {'type': 'global_avg_pool2d'}, {}
+            spatial = False
+        elif kind == 'Flatten':
+            spec, tensors = {'type': 'flatten'}, {}
+            spatial = False
+        elif kind == 'Dropout':
+            spec, tensors = {'type': 'dropout'}, {}
+        elif kind == 'Activation':
+            spec, tensors = {'type': 'activation', 'activation': _activation_name(config)}, {}
+        else:
+            raise ValueError(f"Unsupported Keras layer: {kind} ({layer.name})")
+
+        layers.append(spec)
+        weights.append(tensors)
+        shape = [int(np.prod(layer.output_shape[1:]))] if not spatial else list(layer.output_shape[1:])
+
+    model = EmotionModel(layers)
+    state_dict = {}
+    for index, tensors in enumerate(weights):
+        for name, value in tensors.items():
+            state_dict[f'blocks.{index}.{name}'] = torch.from_numpy(np.ascontiguousarray(value, dtype=np.float32))
+    # Catch any mismatch between the spec and the copied tensors (BatchNorm's
+    # num_batches_tracked counter has no Keras equivalent and keeps its default)
+    result = model.load_state_dict(state_dict, strict=False)
+    missing = [k for k in result.missing_keys if not k.endswith('num_batches_tracked')]
+    if missing or result.unexpected_keys:
+        raise ValueError(f"Weight mismatch: missing={missing}, unexpected={result.unexpected_keys}")
+    return layers, model.state_dict()
+
+
+def check_parity(keras_model, torch_model, num_samples=32, atol=1e-4, seed=0):
+    """Compare Keras and PyTorch outputs on random 48x48 grayscale inputs."""
+    rng = np.random.default_rng(seed)
+    inputs = rng.random((num_samples, IMG_SIZE, IMG_SIZE, 1), dtype=np.float32)
+    # Include the edge cases of all-black and all-white faces
+    inputs[0] = 0.0
+    inputs[1] = 1.0
+
+    keras_out = keras_model.predict(inputs, verbose=0)
+    with torch.no_grad():
+        torch_out = torch_model(torch.from_numpy(inputs)).numpy()
+
+    max_diff = float(np.max(np.abs(keras_out - torch_out)))
+    argmax_match = bool(np.all(np.argmax(keras_out, axis=1) == np.argmax(torch_out, axis=1)))
+    return max_diff <= atol and argmax_match, max_diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the Keras emotion model to PyTorch.")
+    parser.add_argument('--input', default=KERAS_MODEL_PATH, help="Path to the Keras .h5 model")
+    parser.add_argument('--output', default=EMOTION_TORCH_MODEL_PATH, help="Path for the PyTorch checkpoint")
+    parser.add_argument('--atol', type=float, default=1e-4, help="Max allowed absolute output difference")
+    args = parser.parse_args()
+
+    keras_model = load_model(args.input)
+    layers, state_dict = convert_keras_model(keras_model)
+    torch.save({'layers': layers, 'state_dict': state_dict}, args.output)
+    print(f"Saved PyTorch emotion model to {args.output}", file=sys.stderr)
+
+    # Verify against the file on disk, i.e. exactly what app.py will load
+    ok, max_diff = check_parity(keras_model, load_emotion_model(args.output), atol=args.atol)
+    print(f"Parity check: max abs diff = {max_diff:.2e} (atol={args.atol})", file=sys.stderr)
+    if not ok:
+        print("Error: PyTorch outputs do not match the Keras model.", file=sys.stderr)
+        sys.exit(1)
+    print("Parity check passed.", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
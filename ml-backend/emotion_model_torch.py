@@ -0,0 +1,79 @@
+# ml-backend/emotion_model_torch.py
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+# Default location of the converted emotion model (see convert_emotion_model.py)
+EMOTION_TORCH_MODEL_PATH = 'emotion_model.pt'
+
+# Keras activation names mapped to their PyTorch equivalents
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': F.relu,
+    'elu': F.elu,
+    'selu': F.selu,
+    'sigmoid': torch.sigmoid,
+    'tanh': torch.tanh,
+    'softmax': lambda x: F.softmax(x, dim=-1),
+}
+
+
+# --- Define the Emotion Model (PyTorch port of the Keras Sequential CNN) ---
+# The architecture is not hard-coded: it is rebuilt from the layer spec written by
+# convert_emotion_model.py, so this module never needs TensorFlow to be installed.
+# Inputs are NHWC (same as the Keras model) so callers can feed the exact same arrays.
+class EmotionModel(nn.Module):
+    def __init__(self, layers):
+        super(EmotionModel, self).__init__()
+        self.layer_specs = layers
+        self.blocks = nn.ModuleList()
+        for spec in layers:
+            self.blocks.append(self._build_block(spec))
+
+    @staticmethod
+    def _build_block(spec):
+        kind = spec['type']
+        if kind == 'conv2d':
+            return nn.Conv2d(spec['in_channels'], spec['out_channels'],
+                             kernel_size=tuple(spec['kernel_size']),
+                             stride=tuple(spec['stride']),
+                             padding=spec['padding'],
+                             bias=spec['use_bias'])
+        if kind == 'dense':
+            return nn.Linear(spec['in_features'], spec['out_features'], bias=spec['use_bias'])
+        if kind == 'batch_norm':
+            # Keras uses the same BatchNormalization layer before and after Flatten
+            bn_cls = nn.BatchNorm2d if spec['spatial'] else nn.BatchNorm1d
+            return bn_cls(spec['num_features'], eps=spec['eps'], affine=spec['affine'])
+        # Parameter-free layers (pooling, flatten, dropout, activation) are applied in forward()
+        return nn.Identity()
+
+    def forward(self, x):
+        x = x.permute(0, 3, 1, 2) # NHWC -> NCHW
+        for spec, block in zip(self.layer_specs, self.blocks):
+            kind = spec['type']
+            if kind == 'max_pool2d':
+                x = F.max_pool2d(x, tuple(spec['kernel_size']), tuple(spec['stride']))
+            elif kind == 'avg_pool2d':
+                x = F.avg_pool2d(x, tuple(spec['kernel_size']), tuple(spec['stride']))
+            elif kind == 'global_avg_pool2d':
+                x = x.mean(dim=(2, 3))
+            elif kind == 'flatten':
+                # Flatten in NHWC order so Dense weights copied from Keras line up
+                x = torch.flatten(x.permute(0, 2, 3, 1), 1)
+            elif kind == 'dropout':
+                continue # No-op at inference time
+            else:
+                x = block(x)
+            activation = spec.get('activation', 'linear')
+            x = ACTIVATIONS[activation](x)
+        return x
+
+
+def load_emotion_model(path=EMOTION_TORCH_MODEL_PATH, device='cpu'):
+    """Load a converted emotion model saved by convert_emotion_model.py."""
+    checkpoint = torch.load(path, map_location=device)
+    model = EmotionModel(checkpoint['layers'])
+    model.load_state_dict(checkpoint['state_dict'])
+    return model.to(device).eval()